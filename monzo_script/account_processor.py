@@ -1,14 +1,16 @@
+import calendar
+import datetime
+import functools
+import logging
 from typing import Protocol
 
-import monzo_pots
-import pot_distrobuters
 from monzo.authentication import Authentication
 from monzo.endpoints.account import Account
+
+import monzo_pots
+import pot_distrobuters
 from pot_manager import PotManager
 from transaction_controlers import AccountTransactionGroup, AccountTransactionGroupInterface
-import datetime
-import calendar
-import logging
 
 logger = logging.getLogger(__name__)
 
@@ -16,18 +18,29 @@ logger = logging.getLogger(__name__)
 class AccountProcessorInterface(Protocol):
     def process(self, transaction_controller: AccountTransactionGroupInterface) -> None: ...
 
+    def next_trigger_time(self, current_time: datetime.datetime) -> datetime.datetime | None:
+        """Earliest time this processor could act without any account activity, None if it only reacts to activity."""
+        return None
+
+    def copy_state(self, processor: "AccountProcessorInterface") -> None:
+        """Take over the state of a live processor of the same type so a shadow copy plans from reality."""
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _transfer_date_for_month(minimum_transfer_date: int, year: int, month: int) -> datetime.datetime:
+    _, days_in_month = calendar.monthrange(year, month)
+    return datetime.datetime(year, month, min(minimum_transfer_date, days_in_month))
+
 
 class PotMinimumProcessor(AccountProcessorInterface):
     def __init__(self, pot_manager: PotManager) -> None:
         self.pot_manager = pot_manager
         self.transfer_dates: dict[str, datetime.datetime] = {}
 
-    def is_pot_ready(self, pot: monzo_pots.MonzoPot) -> bool:
+    def is_pot_ready(self, pot: monzo_pots.MonzoPot, current_time: datetime.datetime) -> bool:
         if pot.minimum_transfer_date:
-            current_time = datetime.datetime.now()
-            _, days_in_month = calendar.monthrange(current_time.year, current_time.month)
-            transfer_date = min(pot.minimum_transfer_date, days_in_month)
-            next_transfer = datetime.datetime(current_time.year, current_time.month, transfer_date)
+            next_transfer = _transfer_date_for_month(pot.minimum_transfer_date, current_time.year, current_time.month)
             if current_time <= next_transfer:
                 return False
             elif (
@@ -37,31 +50,49 @@ class PotMinimumProcessor(AccountProcessorInterface):
                 return False
         return True
 
-    def post_pot_transfer(self, pot: monzo_pots.MonzoPot):
+    def post_pot_transfer(self, pot: monzo_pots.MonzoPot, current_time: datetime.datetime):
         if pot.minimum_transfer_date:
-            current_time = datetime.datetime.now()
-            _, days_in_month = calendar.monthrange(current_time.year, current_time.month)
-            transfer_date = min(pot.minimum_transfer_date, days_in_month)
-            next_transfer = datetime.datetime(current_time.year, current_time.month, transfer_date)
+            next_transfer = _transfer_date_for_month(pot.minimum_transfer_date, current_time.year, current_time.month)
             self.transfer_dates[pot.pot_id] = next_transfer
 
-    def _get_minimum_pots(self) -> list[monzo_pots.MonzoPot]:
+    def copy_state(self, processor: AccountProcessorInterface) -> None:
+        if isinstance(processor, PotMinimumProcessor):
+            self.transfer_dates = dict(processor.transfer_dates)
+
+    def _pot_trigger_time(self, pot: monzo_pots.MonzoPot, current_time: datetime.datetime) -> datetime.datetime:
+        this_month = _transfer_date_for_month(pot.minimum_transfer_date, current_time.year, current_time.month)
+        if current_time <= this_month:
+            return this_month
+        next_month = (this_month.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+        return _transfer_date_for_month(pot.minimum_transfer_date, next_month.year, next_month.month)
+
+    def next_trigger_time(self, current_time: datetime.datetime) -> datetime.datetime | None:
+        trigger_times: list[datetime.datetime] = []
+        for pot in self.pot_manager.pots:
+            if not pot.minimum_transfer_date:
+                continue
+            if (pot.minimum_amount and not pot.saving_priority) or (pot.funding_source and not pot.locked):
+                trigger_times.append(self._pot_trigger_time(pot, current_time))
+        return min(trigger_times, default=None)
+
+    def _get_minimum_pots(self, current_time: datetime.datetime) -> list[monzo_pots.MonzoPot]:
         minimum_pots: list[monzo_pots.MonzoPot] = []
         for pot in self.pot_manager.pots:
-            if pot.minimum_amount and not pot.saving_priority and self.is_pot_ready(pot):
+            if pot.minimum_amount and not pot.saving_priority and self.is_pot_ready(pot, current_time):
                 minimum_pots.append(pot)
         return minimum_pots
 
-    def _get_funding_pots(self) -> list[monzo_pots.MonzoPot]:
+    def _get_funding_pots(self, current_time: datetime.datetime) -> list[monzo_pots.MonzoPot]:
         funding_pots: list[monzo_pots.MonzoPot] = []
         for pot in self.pot_manager.pots:
-            if pot.funding_source and not pot.locked and self.is_pot_ready(pot):
+            if pot.funding_source and not pot.locked and self.is_pot_ready(pot, current_time):
                 funding_pots.append(pot)
         return funding_pots
 
     def process(self, transaction_controller: AccountTransactionGroupInterface) -> None:
-        processing_pots = self._get_minimum_pots()
-        funding_pots = sorted(self._get_funding_pots(), key=lambda pot: pot.funding_priority, reverse=True)
+        current_time = datetime.datetime.now()
+        processing_pots = self._get_minimum_pots(current_time)
+        funding_pots = sorted(self._get_funding_pots(current_time), key=lambda pot: pot.funding_priority, reverse=True)
         processed_pots: list[monzo_pots.MonzoPot] = []
         for funding_pot in funding_pots:
             with transaction_controller.change_transaction_creator("PMP"):
@@ -74,7 +105,7 @@ class PotMinimumProcessor(AccountProcessorInterface):
                     processed_pots.extend(map(lambda x: x[0], filter(lambda x: x not in processed_pots, pots_transferred)))
                     processed_pots.append(funding_pot)
         for pot in processed_pots:
-            self.post_pot_transfer(pot)
+            self.post_pot_transfer(pot, current_time)
 
 
 class PotGoalProcessor(AccountProcessorInterface):
@@ -194,6 +225,10 @@ class RoundupProcessor(AccountProcessorInterface):
         self.pot_manager = pot_manager
         self.old_balances: dict[str, int] = {}
 
+    def copy_state(self, processor: AccountProcessorInterface) -> None:
+        if isinstance(processor, RoundupProcessor):
+            self.old_balances = dict(processor.old_balances)
+
     def _get_saving_pots(self) -> list[monzo_pots.MonzoPot]:
         dest_pots: list[monzo_pots.MonzoPot] = []
         for pot in self.pot_manager.pots:
@@ -233,6 +268,18 @@ class RoundupProcessor(AccountProcessorInterface):
                 self.old_balances[funding_pot.pot_id] = transaction_controller.get_pot_factored_balance(funding_pot)
 
 
+def diff_plans(
+    live_transfers: dict[tuple[str | None, str | None], int], shadow_transfers: dict[tuple[str | None, str | None], int]
+) -> list[tuple[tuple[str | None, str | None], int, int]]:
+    differences: list[tuple[tuple[str | None, str | None], int, int]] = []
+    for transfer in live_transfers.keys() | shadow_transfers.keys():
+        live_amount = live_transfers.get(transfer, 0)
+        shadow_amount = shadow_transfers.get(transfer, 0)
+        if live_amount != shadow_amount:
+            differences.append((transfer, live_amount, shadow_amount))
+    return sorted(differences, key=lambda difference: (difference[0][0] or "", difference[0][1] or ""))
+
+
 class AccountManager:
     def __init__(self, auth: Authentication, account: Account, pot_manager: PotManager, dry_run: bool = True) -> None:
         self.auth = auth
@@ -240,16 +287,83 @@ class AccountManager:
         self.pot_manager = pot_manager
         self.dry_run = dry_run
         self.account_processors: list[AccountProcessorInterface] = []
+        self.shadow_pipelines: dict[str, list[AccountProcessorInterface]] = {}
 
     def _make_transaction_group(self) -> AccountTransactionGroupInterface:
         return AccountTransactionGroup.from_account(self.auth, self.account, self.pot_manager)
 
+    def _pot_snapshot(self) -> dict[str, tuple[str, int, int | None, bool]]:
+        # pot names carry the processor tags so a rename counts as activity too
+        return {pot.pot_id: (pot.pot.name, pot.balance, pot.pot.goal_amount, pot.locked) for pot in self.pot_manager.pots}
+
     def register_processor(self, processor: AccountProcessorInterface) -> None:
         self.account_processors.append(processor)
 
-    def optimize_account(self) -> None:
+    def register_shadow_processor(self, pipeline: str, processor: AccountProcessorInterface) -> None:
+        """Shadow pipelines plan against the same pot snapshot as the live run but are never executed.
+
+        Before each pass a shadow processor copies the state of the live processor of the same type, so
+        stateful processors without a live counterpart are only meaningful for a single pass.
+        """
+        if not any(type(live_processor) is type(processor) for live_processor in self.account_processors):
+            logger.warning(
+                f"shadow: ({pipeline}), {type(processor).__name__} has no live counterpart, "
+                "its state will drift from the live run"
+            )
+        self.shadow_pipelines.setdefault(pipeline, []).append(processor)
+
+    def _sync_shadow_state(self) -> None:
+        for processors in self.shadow_pipelines.values():
+            for shadow_processor in processors:
+                for live_processor in self.account_processors:
+                    if type(live_processor) is type(shadow_processor):
+                        shadow_processor.copy_state(live_processor)
+                        break
+
+    def _pot_name(self, pot_id: str | None) -> str:
+        if pot_id is None:
+            return "main account"
+        for pot in self.pot_manager.pots:
+            if pot.pot_id == pot_id:
+                return pot.name
+        return pot_id
+
+    def _run_shadow_pipelines(self, live_transfers: dict[tuple[str | None, str | None], int]) -> None:
+        for pipeline, processors in self.shadow_pipelines.items():
+            try:
+                transaction_controler = self._make_transaction_group()
+                for account_processor in processors:
+                    account_processor.process(transaction_controler)
+                shadow_transfers = transaction_controler.planned_transfers()
+            except Exception:
+                logger.exception(f"shadow: ({pipeline}), pipeline failed")
+                continue
+            logger.debug(f"shadow: ({pipeline}), planned transfers: {shadow_transfers}")
+            for (src_id, dest_id), live_amount, shadow_amount in diff_plans(live_transfers, shadow_transfers):
+                logger.info(
+                    f"shadow: ({pipeline}), ({self._pot_name(src_id)}) to ({self._pot_name(dest_id)}), "
+                    f"live: {live_amount}, shadow: {shadow_amount}"
+                )
+            if shadow_transfers == live_transfers:
+                logger.debug(f"shadow: ({pipeline}), plan matches live")
+
+    def next_trigger_time(self, current_time: datetime.datetime) -> datetime.datetime | None:
+        # only the live processors set the cadence, a shadow pipeline must not change how often the account is polled
+        trigger_times = [processor.next_trigger_time(current_time) for processor in self.account_processors]
+        return min((trigger_time for trigger_time in trigger_times if trigger_time is not None), default=None)
+
+    def optimize_account(self) -> bool:
+        """Run every processor once, returns True if transfers were executed or the pots changed since the last fetch."""
+        # shadows take the live state from before this pass, the live processors update theirs while planning
+        self._sync_shadow_state()
         transaction_controler = self._make_transaction_group()
         for account_processor in self.account_processors:
             account_processor.process(transaction_controler)
+        # shadows must plan before execute, deposits and withdrawals write the new balances back into the pots
+        self._run_shadow_pipelines(transaction_controler.planned_transfers())
+        previous_snapshot = self._pot_snapshot()
         transaction_controler.execute(self.dry_run)
         self.pot_manager.update_pots()
+        # a dry run plans the same transfers every pass, only executed ones count as activity
+        executed = transaction_controler.has_transactions() and not self.dry_run
+        return executed or previous_snapshot != self._pot_snapshot()
@@ -1,7 +1,12 @@
+import datetime
 import logging
 import sys
 import time
 
+from monzo.authentication import Authentication
+from monzo.endpoints.account import Account
+from monzo.handlers.filesystem import FileSystem
+
 from account_processor import (
     AccountManager,
     PotGoalProcessor,
@@ -10,9 +15,7 @@ from account_processor import (
     SavingsOverflowProcessor,
     SavingsPercentageProcessor,
 )
-from monzo.authentication import Authentication
-from monzo.endpoints.account import Account
-from monzo.handlers.filesystem import FileSystem
+from poll_scheduler import PollScheduler
 from pot_manager import PotManager
 
 logger = logging.getLogger()
@@ -61,9 +64,15 @@ for account in accounts:
         account_manager.register_processor(RoundupProcessor(pot_manager))
         account_managers.append(account_manager)
 
+scheduler = PollScheduler()
+sleep_time = scheduler.min_interval
 while 1:
-    time.sleep(2)
+    time.sleep(sleep_time)
+    activity = False
     for account_manager in account_managers:
         logger.debug(f"optimizing account {account_manager}")
-        account_manager.optimize_account()
-
+        activity = account_manager.optimize_account() or activity
+    current_time = datetime.datetime.now()
+    sleep_time = scheduler.next_sleep(
+        activity, [account_manager.next_trigger_time(current_time) for account_manager in account_managers], current_time
+    )
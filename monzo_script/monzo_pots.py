@@ -1,3 +1,4 @@
+import logging
 import time
 from datetime import datetime
 from uuid import uuid4
@@ -6,10 +7,12 @@ from monzo.authentication import Authentication
 from monzo.endpoints.account import Account
 from monzo.endpoints.pot import Pot
 from monzo.endpoints.transaction import Transaction
-import logging
 
 logger = logging.getLogger(__name__)
 
+TRANSACTION_PAGE_SIZE = 100
+
+
 class MonzoPot(object):
     def __init__(
         self,
@@ -175,17 +178,30 @@ class MonzoPot(object):
             time.sleep(2)
 
 
-def fetch_pots(auth: Authentication, account: Account, transaction_since: datetime):
-    account_id = account.account_id
-    pots = Pot.fetch(auth, account.account_id)
+def fetch_transactions(auth: Authentication, account: Account, transaction_since: datetime, **kwargs) -> list[Transaction]:
     while True:
         try:
-            transactions = Transaction.fetch(auth, account_id, since=transaction_since)
+            return Transaction.fetch(auth, account.account_id, since=transaction_since, **kwargs)
         except Exception as e:
             logger.exception(e)
             time.sleep(5)
-            continue
-        break
+
+
+def fetch_transaction_history(auth: Authentication, account: Account, transaction_since: datetime) -> list[Transaction]:
+    transactions: dict[str, Transaction] = {}
+    while True:
+        page = fetch_transactions(auth, account, transaction_since, limit=TRANSACTION_PAGE_SIZE)
+        new_transactions = [transaction for transaction in page if transaction.transaction_id not in transactions]
+        for transaction in new_transactions:
+            transactions[transaction.transaction_id] = transaction
+        if len(page) < TRANSACTION_PAGE_SIZE or not new_transactions:
+            return list(transactions.values())
+        # pages overlap on the boundary timestamp, the id check above drops the repeats
+        transaction_since = max(transaction.created for transaction in page)
+
+
+def fetch_pots(auth: Authentication, account: Account, transactions: list[Transaction]):
+    pots = Pot.fetch(auth, account.account_id)
     monzo_pots: list[MonzoPot] = []
     for pot in pots:
         if not pot.deleted:
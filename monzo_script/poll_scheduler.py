@@ -0,0 +1,39 @@
+import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PollScheduler(object):
+    """Sleeps until the earliest processor trigger, backing off exponentially while the accounts are idle."""
+
+    def __init__(self, min_interval: float = 2, max_interval: float = 300, backoff: float = 2) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+
+    def next_sleep(
+        self, activity: bool, trigger_times: list[datetime.datetime | None], current_time: datetime.datetime
+    ) -> float:
+        previous_interval = self.interval
+        if activity:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        next_trigger = min((trigger_time for trigger_time in trigger_times if trigger_time is not None), default=None)
+        sleep_time = self.interval
+        if next_trigger is not None:
+            until_trigger = (next_trigger - current_time).total_seconds()
+            sleep_time = max(min(sleep_time, until_trigger), 0)
+        # only log at info when the cadence changes, a busy account would flood the log otherwise
+        log_level = logging.INFO if self.interval != previous_interval else logging.DEBUG
+        logger.log(
+            log_level,
+            "schedule: activity: %s, idle interval: %.1fs, next trigger: %s, sleeping: %.1fs",
+            activity,
+            self.interval,
+            next_trigger.isoformat() if next_trigger else "none",
+            sleep_time,
+        )
+        return sleep_time
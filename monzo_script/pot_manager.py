@@ -1,21 +1,49 @@
 from datetime import datetime, timedelta
 from typing import Self
 
-import monzo_pots
 from monzo.authentication import Authentication
 from monzo.endpoints.account import Account
+from monzo.endpoints.transaction import Transaction
+
+import monzo_pots
+from spend_index import SpendIndex, SpendWindow, as_utc, utc_now
+
+RECENT_TRANSACTIONS = timedelta(days=1)
 
 
 class PotManager(object):
-    def __init__(self, auth: Authentication, account: Account, pots: list[monzo_pots.MonzoPot]):
+    def __init__(
+        self, auth: Authentication, account: Account, pots: list[monzo_pots.MonzoPot], spend_index: SpendIndex | None = None
+    ):
         self.auth = auth
         self.account = account
         self.pots = pots
+        self.spend_index = spend_index or SpendIndex()
+        self.recent_transactions: dict[str, Transaction] = {}
 
     @classmethod
     def from_account(cls, auth: Authentication, account: Account) -> Self:
-        pots = monzo_pots.fetch_pots(auth, account, datetime.now() - timedelta(days=1))
-        return cls(auth, account, pots)
+        # one paginated month seeds the spend index, the pots only look at the last day of it
+        history_since = utc_now() - SpendWindow.MONTH.value
+        transactions = monzo_pots.fetch_transaction_history(auth, account, history_since)
+        pot_manager = cls(auth, account, [])
+        pot_manager._sync(transactions, history_since)
+        return pot_manager
+
+    def _sync(self, transactions: list[Transaction], since: datetime) -> None:
+        self.spend_index.update(transactions, since)
+        for transaction in transactions:
+            self.recent_transactions[transaction.transaction_id] = transaction
+        cutoff = utc_now() - RECENT_TRANSACTIONS
+        self.recent_transactions = {
+            transaction_id: transaction
+            for transaction_id, transaction in self.recent_transactions.items()
+            if as_utc(transaction.created) >= cutoff
+        }
+        self.pots = monzo_pots.fetch_pots(self.auth, self.account, list(self.recent_transactions.values()))
 
     def update_pots(self):
-        self.pots = monzo_pots.fetch_pots(self.auth, self.account, datetime.now() - timedelta(days=1))
+        # only fetch what the index hasn't seen yet, plus anything still pending so settled amounts get picked up
+        oldest_since = utc_now() - SpendWindow.MONTH.value
+        since = max(self.spend_index.next_fetch_since() or utc_now() - RECENT_TRANSACTIONS, oldest_since)
+        self._sync(monzo_pots.fetch_transaction_history(self.auth, self.account, since), since)
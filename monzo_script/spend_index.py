@@ -0,0 +1,158 @@
+import bisect
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+
+from monzo.endpoints.transaction import Transaction
+
+
+class SpendWindow(Enum):
+    DAY = timedelta(days=1)
+    WEEK = timedelta(days=7)
+    MONTH = timedelta(days=30)
+
+
+def as_utc(time: datetime) -> datetime:
+    if time.tzinfo is None:
+        return time
+    return time.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RollingTotal(object):
+    def __init__(self, window: timedelta) -> None:
+        self.window = window
+        self.total = 0
+        self.entries: deque[tuple[datetime, int]] = deque()
+
+    def add(self, created: datetime, amount: int) -> None:
+        self.total += amount
+        if not self.entries or created >= self.entries[-1][0]:
+            self.entries.append((created, amount))
+        else:
+            # the api doesn't promise ordering, keep the deque sorted so expiry can pop from the left
+            bisect.insort(self.entries, (created, amount))
+
+    def expire(self, now: datetime) -> None:
+        cutoff = now - self.window
+        while self.entries and self.entries[0][0] < cutoff:
+            _, amount = self.entries.popleft()
+            self.total -= amount
+
+
+class SpendIndex(object):
+    """Rolling debit/credit totals per pot and per category, amounts in pence.
+
+    Totals are as of the last update. An update only does work for transactions that are new or whose
+    amount changed, and each total drops its expired entries when it is next queried.
+    """
+
+    def __init__(self) -> None:
+        self.totals: dict[tuple[str, str, str], dict[SpendWindow, RollingTotal]] = {}
+        self.recorded: dict[str, tuple[datetime, list[tuple[tuple[str, str, str], int]]]] = {}
+        self.recorded_order: deque[tuple[datetime, str]] = deque()
+        self.pending: dict[str, datetime] = {}
+        self.latest_created: datetime | None = None
+        self.covered_since: datetime | None = None
+        self.now = utc_now()
+
+    def _add(self, key: tuple[str, str, str], created: datetime, amount: int) -> None:
+        if key not in self.totals:
+            self.totals[key] = {window: RollingTotal(window.value) for window in SpendWindow}
+        for rolling_total in self.totals[key].values():
+            if created >= self.now - rolling_total.window:
+                rolling_total.add(created, amount)
+
+    @staticmethod
+    def _contributions(transaction: Transaction) -> list[tuple[tuple[str, str, str], int]]:
+        if transaction.decline_reason:
+            return []
+        amount = transaction.amount
+        pot_id = transaction.metadata.get("pot_id", "")
+        contributions: list[tuple[tuple[str, str, str], int]] = []
+        # amounts are from the account's point of view, money moved into a pot is negative
+        if pot_id:
+            if amount > 0:
+                contributions.append((("pot", pot_id, "debit"), amount))
+            elif amount < 0:
+                contributions.append((("pot", pot_id, "credit"), -amount))
+        if amount < 0:
+            contributions.append((("category", transaction.category, "debit"), -amount))
+        elif amount > 0:
+            contributions.append((("category", transaction.category, "credit"), amount))
+        return contributions
+
+    def _record(self, transaction: Transaction) -> None:
+        contributions = self._contributions(transaction)
+        if transaction.transaction_id in self.recorded:
+            created, recorded_contributions = self.recorded[transaction.transaction_id]
+            if contributions != recorded_contributions:
+                # pending transactions can settle at a different amount (fx, tips) or get declined, swap the old values out
+                for key, amount in recorded_contributions:
+                    self._add(key, created, -amount)
+                for key, amount in contributions:
+                    self._add(key, created, amount)
+                self.recorded[transaction.transaction_id] = (created, contributions)
+        else:
+            created = as_utc(transaction.created)
+            if created < self.now - SpendWindow.MONTH.value:
+                return
+            if not self.recorded_order or created >= self.recorded_order[-1][0]:
+                self.recorded_order.append((created, transaction.transaction_id))
+            else:
+                bisect.insort(self.recorded_order, (created, transaction.transaction_id))
+            self.recorded[transaction.transaction_id] = (created, contributions)
+            for key, amount in contributions:
+                self._add(key, created, amount)
+            if self.latest_created is None or created > self.latest_created:
+                self.latest_created = created
+        if transaction.amount_is_pending:
+            self.pending[transaction.transaction_id] = created
+        else:
+            self.pending.pop(transaction.transaction_id, None)
+
+    def update(self, transactions: list[Transaction], since: datetime, now: datetime | None = None) -> None:
+        """Feed in every transaction fetched from ``since`` onwards, times are UTC."""
+        since = as_utc(since)
+        # a gap between fetches means anything older than this fetch may be missing
+        if self.covered_since is None or since > self.now:
+            self.covered_since = since
+        self.now = as_utc(now) if now else utc_now()
+        for transaction in transactions:
+            self._record(transaction)
+        cutoff = self.now - SpendWindow.MONTH.value
+        while self.recorded_order and self.recorded_order[0][0] < cutoff:
+            _, transaction_id = self.recorded_order.popleft()
+            del self.recorded[transaction_id]
+            self.pending.pop(transaction_id, None)
+
+    def next_fetch_since(self) -> datetime | None:
+        """Where the next fetch should start so it returns new transactions and re-delivers unsettled ones."""
+        if self.latest_created is None:
+            return None
+        return min([self.latest_created, *self.pending.values()])
+
+    def is_complete(self, window: SpendWindow) -> bool:
+        return self.covered_since is not None and self.covered_since <= self.now - window.value
+
+    def _total(self, key: tuple[str, str, str], window: SpendWindow) -> int:
+        rolling_totals = self.totals.get(key)
+        if not rolling_totals:
+            return 0
+        rolling_totals[window].expire(self.now)
+        return rolling_totals[window].total
+
+    def pot_debit(self, pot_id: str, window: SpendWindow) -> int:
+        return self._total(("pot", pot_id, "debit"), window)
+
+    def pot_credit(self, pot_id: str, window: SpendWindow) -> int:
+        return self._total(("pot", pot_id, "credit"), window)
+
+    def category_debit(self, category: str, window: SpendWindow) -> int:
+        return self._total(("category", category, "debit"), window)
+
+    def category_credit(self, category: str, window: SpendWindow) -> int:
+        return self._total(("category", category, "credit"), window)
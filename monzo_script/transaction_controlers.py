@@ -1,10 +1,12 @@
+import logging
+from collections import defaultdict
 from typing import Self
 
-import monzo_pots
 from monzo.authentication import Authentication
 from monzo.endpoints.account import Account
+
+import monzo_pots
 from pot_manager import PotManager
-import logging
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,10 @@ class AccountTransactionGroupInterface(object):
 
     def execute(self, dry_run: bool): ...
 
+    def has_transactions(self) -> bool: ...
+
+    def planned_transfers(self) -> dict[tuple[str | None, str | None], int]: ...
+
     def get_pot_balance(self, pot: monzo_pots.MonzoPot) -> int: ...
 
     def get_pot_factored_balance(self, pot: monzo_pots.MonzoPot) -> int: ...
@@ -83,6 +89,20 @@ class AccountTransactionGroup(AccountTransactionGroupInterface):
             self._update_pot_balance(src_pot, -amount)
             self.account_balance += amount
 
+    def has_transactions(self) -> bool:
+        return bool(self.pot_transactions or self.pot_withdraw_transactions or self.pot_deposit_transactions)
+
+    def planned_transfers(self) -> dict[tuple[str | None, str | None], int]:
+        """Total planned per (source pot id, destination pot id), None stands for the main account."""
+        transfers: defaultdict[tuple[str | None, str | None], int] = defaultdict(int)
+        for _, src_pot, dest_pot, amount in self.pot_transactions:
+            transfers[(src_pot.pot_id, dest_pot.pot_id)] += amount
+        for _, _, src_pot, amount in self.pot_withdraw_transactions:
+            transfers[(src_pot.pot_id, None)] += amount
+        for _, _, dest_pot, amount in self.pot_deposit_transactions:
+            transfers[(None, dest_pot.pot_id)] += amount
+        return dict(transfers)
+
     def execute(self, dry_run: bool):
             for account_creator, src_pot, dest_pot, amount in self.pot_transactions:
                 logger.info(
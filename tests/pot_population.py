@@ -0,0 +1,67 @@
+import random
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+from monzo_pots import MonzoPot
+from pot_distrobuters import PotTarget
+from transaction_controlers import AccountTransactionGroup
+
+ZERO_PRIORITY_CHANCE = 0.1
+NEAR_TARGET_CHANCE = 0.3
+OVER_TARGET_CHANCE = 0.2
+
+
+@dataclass
+class PotPopulation:
+    src_pot: MonzoPot
+    dest_pots: list[PotTarget]
+
+    def transaction_group(self) -> AccountTransactionGroup:
+        # balances are tracked in memory by the group, nothing here touches the api
+        return AccountTransactionGroup(None, None, 0, [self.src_pot, *(target.pot for target in self.dest_pots)])
+
+
+def make_pot(pot_id: str, name: str, balance: int, goal: int = 0) -> MonzoPot:
+    pot = SimpleNamespace(
+        pot_id=pot_id,
+        name=name,
+        balance=balance,
+        goal_amount=goal,
+        locked=False,
+        locked_until=None,
+        pot_type="default",
+        deleted=False,
+    )
+    return MonzoPot(None, pot, None, [], [])
+
+
+def _skewed_priority(rng: random.Random, allow_zero: bool) -> int:
+    if allow_zero and rng.random() < ZERO_PRIORITY_CHANCE:
+        return 0
+    # most pots share a handful of low priorities with a long tail of high ones
+    return min(int(rng.paretovariate(1.2)), 50)
+
+
+def _dest_balance(rng: random.Random, target: int) -> int:
+    roll = rng.random()
+    if roll < NEAR_TARGET_CHANCE:
+        return rng.randint(max(target - 500, 0), target)  # within a fiver of the target
+    if roll < NEAR_TARGET_CHANCE + OVER_TARGET_CHANCE:
+        return rng.randint(target, target + 10_000)  # at or over the target
+    return rng.randint(0, target)
+
+
+def make_population(size: int, seed: int, allow_zero_priority: bool = False) -> PotPopulation:
+    rng = random.Random(seed)
+    dest_pots: list[PotTarget] = []
+    for index in range(size):
+        target = rng.randint(1, 2_000) * 100
+        priority = _skewed_priority(rng, allow_zero_priority)
+        pot = make_pot(f"pot_{index:06d}", f"Dest {index}", _dest_balance(rng, target), target)
+        dest_pots.append(PotTarget(pot, target, priority))
+    # the source sometimes covers every shortfall and sometimes only a fraction of it
+    shortfall = sum(max(target.target - target.pot.balance, 0) for target in dest_pots)
+    minimum = rng.randint(0, 50)
+    src_balance = minimum * 100 + int(shortfall * rng.choice((0.01, 0.3, 1, 2))) + rng.randint(0, 99)
+    src_pot = make_pot("pot_src", f"Source FP:1,M:{minimum}", src_balance)
+    return PotPopulation(src_pot, dest_pots)
@@ -0,0 +1,202 @@
+import datetime
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from account_processor import AccountManager, PotGoalProcessor, PotMinimumProcessor, RoundupProcessor, diff_plans
+from tests.pot_population import make_pot
+from transaction_controlers import AccountTransactionGroup
+
+
+def _processor(*pots) -> PotMinimumProcessor:
+    return PotMinimumProcessor(SimpleNamespace(pots=list(pots)))
+
+
+@pytest.mark.parametrize(
+    ("name", "current_time", "expected"),
+    [
+        ("Bills M:10,MTD:15", datetime.datetime(2026, 3, 10), datetime.datetime(2026, 3, 15)),
+        ("Bills M:10,MTD:15", datetime.datetime(2026, 3, 15), datetime.datetime(2026, 3, 15)),
+        ("Bills M:10,MTD:15", datetime.datetime(2026, 3, 15, 0, 1), datetime.datetime(2026, 4, 15)),
+        ("Bills M:10,MTD:31", datetime.datetime(2026, 2, 10), datetime.datetime(2026, 2, 28)),
+        ("Bills M:10,MTD:31", datetime.datetime(2028, 2, 10), datetime.datetime(2028, 2, 29)),
+        ("Bills M:10,MTD:31", datetime.datetime(2026, 1, 31, 9), datetime.datetime(2026, 2, 28)),
+        ("Bills M:10,MTD:5", datetime.datetime(2026, 12, 20), datetime.datetime(2027, 1, 5)),
+        ("Src FP:1,MTD:5", datetime.datetime(2026, 12, 1), datetime.datetime(2026, 12, 5)),
+    ],
+    ids=["before", "on-boundary", "after", "31st-february", "leap-year", "january-rollover", "december-rollover", "funding"],
+)
+def test_pot_minimum_next_trigger_time(name, current_time, expected):
+    processor = _processor(make_pot("pot_1", name, 0))
+
+    assert processor.next_trigger_time(current_time) == expected
+
+
+def test_pot_minimum_next_trigger_time_picks_earliest_pot():
+    processor = _processor(
+        make_pot("pot_1", "Rent M:10,MTD:28", 0),
+        make_pot("pot_2", "Bills M:10,MTD:20", 0),
+        make_pot("pot_3", "Fun M:10", 0),
+    )
+
+    assert processor.next_trigger_time(datetime.datetime(2026, 3, 10)) == datetime.datetime(2026, 3, 20)
+
+
+def test_pot_minimum_next_trigger_time_ignores_untimed_pots():
+    processor = _processor(make_pot("pot_1", "Fun M:10", 0), make_pot("pot_2", "Spare MTD:5", 0))
+
+    assert processor.next_trigger_time(datetime.datetime(2026, 3, 10)) is None
+
+
+def test_pot_minimum_ready_once_per_month():
+    pot = make_pot("pot_1", "Bills M:10,MTD:15", 0)
+    processor = _processor(pot)
+
+    assert not processor.is_pot_ready(pot, datetime.datetime(2026, 3, 14))
+    assert processor.is_pot_ready(pot, datetime.datetime(2026, 3, 16))
+    processor.post_pot_transfer(pot, datetime.datetime(2026, 3, 16))
+    assert not processor.is_pot_ready(pot, datetime.datetime(2026, 3, 20))
+    assert processor.is_pot_ready(pot, datetime.datetime(2026, 4, 16))
+
+
+class FailingProcessor(RoundupProcessor):
+    def process(self, transaction_controller):
+        raise RuntimeError("broken canary")
+
+
+def _roundup_manager() -> AccountManager:
+    pots = [make_pot("pot_src", "Spare RV:50,RM:1", 4_000), make_pot("pot_save", "Savings SP:1", 0, 10_000)]
+    pot_manager = SimpleNamespace(pots=pots, update_pots=lambda: None)
+    account = SimpleNamespace(balance=SimpleNamespace(balance=0))
+    return AccountManager(None, account, pot_manager, dry_run=True)
+
+
+def test_diff_plans():
+    live = {("a", "b"): 100, ("a", None): 50, (None, "c"): 10}
+    shadow = {("a", "b"): 100, ("a", None): 70, ("b", "c"): 5}
+
+    assert diff_plans(live, shadow) == [((None, "c"), 10, 0), (("a", None), 50, 70), (("b", "c"), 0, 5)]
+
+
+def test_planned_transfers_keyed_by_pot_id():
+    src = make_pot("pot_src", "Src", 1_000)
+    first = make_pot("pot_1", "Same", 0)
+    second = make_pot("pot_2", "Same", 0)
+    decoy = make_pot("pot_3", "main account", 1_000)
+    tc = AccountTransactionGroup(None, None, 1_000, [src, first, second, decoy])
+    tc.transfer_between_pots(src, first, 100)
+    tc.transfer_between_pots(src, second, 200)
+    tc.transfer_pot_to_account(None, decoy, 50)
+    tc.transfer_account_to_pot(None, decoy, 25)
+
+    assert tc.planned_transfers() == {
+        ("pot_src", "pot_1"): 100,
+        ("pot_src", "pot_2"): 200,
+        ("pot_3", None): 50,
+        (None, "pot_3"): 25,
+    }
+
+
+def test_failing_shadow_does_not_stop_live_run(caplog):
+    manager = _roundup_manager()
+    live = RoundupProcessor(manager.pot_manager)
+    live.old_balances["pot_src"] = 5_000
+    manager.register_processor(live)
+    manager.register_shadow_processor("canary", FailingProcessor(manager.pot_manager))
+    manager.dry_run = False
+    for pot in manager.pot_manager.pots:
+        _update_balance_on_transfer(pot)
+
+    with caplog.at_level(logging.ERROR):
+        assert manager.optimize_account()
+    assert "(canary), pipeline failed" in caplog.text
+    assert [pot.balance for pot in manager.pot_manager.pots] == [3_500, 500]
+
+
+def test_shadow_diff_logged_with_pot_names(caplog):
+    manager = _roundup_manager()
+    live = RoundupProcessor(manager.pot_manager)
+    live.old_balances["pot_src"] = 5_000
+    manager.register_processor(live)
+    manager.register_shadow_processor("minimums", PotMinimumProcessor(manager.pot_manager))
+
+    with caplog.at_level(logging.INFO):
+        manager.optimize_account()
+    assert "(minimums), PotMinimumProcessor has no live counterpart" in caplog.text
+    assert "shadow: (minimums), (Spare) to (Savings), live: 500, shadow: 0" in caplog.text
+
+
+def test_shadow_state_synced_from_live(caplog):
+    manager = _roundup_manager()
+    live = RoundupProcessor(manager.pot_manager)
+    live.old_balances["pot_src"] = 5_000
+    shadow = RoundupProcessor(manager.pot_manager)
+    manager.register_processor(live)
+    manager.register_shadow_processor("canary", shadow)
+
+    with caplog.at_level(logging.INFO):
+        manager.optimize_account()
+    # the live run spent 1000 since the last pass, an unsynced shadow would have planned no roundup at all
+    assert "shadow:" not in caplog.text
+    assert shadow.old_balances == live.old_balances == {"pot_src": 3_500}
+
+
+def _update_balance_on_transfer(pot):
+    # the api library writes the new balance back into the pot object after a deposit or withdrawal
+    def deposit(amount, account):
+        pot.pot.balance += amount
+
+    def withdraw(amount, account):
+        pot.pot.balance -= amount
+
+    pot.deposit = deposit
+    pot.withdraw = withdraw
+    return pot
+
+
+def test_shadow_plans_from_pre_execute_balances(caplog):
+    pots = [
+        _update_balance_on_transfer(make_pot("pot_src", "Src FP:1", 3_000)),
+        _update_balance_on_transfer(make_pot("pot_goal", "Goal WP:1", 0, 10_000)),
+    ]
+    pot_manager = SimpleNamespace(pots=pots, update_pots=lambda: None)
+    manager = AccountManager(None, SimpleNamespace(balance=SimpleNamespace(balance=0)), pot_manager, dry_run=False)
+    manager.register_processor(PotGoalProcessor(pot_manager))
+    manager.register_shadow_processor("identical", PotGoalProcessor(pot_manager))
+
+    with caplog.at_level(logging.INFO):
+        manager.optimize_account()
+    assert [pot.balance for pot in pots] == [0, 3_000]
+    assert "shadow:" not in caplog.text
+
+
+def _goal_manager(dry_run: bool) -> AccountManager:
+    pots = [
+        _update_balance_on_transfer(make_pot("pot_src", "Src FP:1", 3_000)),
+        _update_balance_on_transfer(make_pot("pot_goal", "Goal WP:1", 0, 10_000)),
+    ]
+    pot_manager = SimpleNamespace(pots=pots, update_pots=lambda: None)
+    manager = AccountManager(None, SimpleNamespace(balance=SimpleNamespace(balance=0)), pot_manager, dry_run=dry_run)
+    manager.register_processor(PotGoalProcessor(pot_manager))
+    return manager
+
+
+def test_dry_run_plans_are_not_activity():
+    manager = _goal_manager(dry_run=True)
+
+    assert [manager.optimize_account() for _ in range(3)] == [False, False, False]
+
+
+def test_executed_transfers_are_activity():
+    manager = _goal_manager(dry_run=False)
+
+    assert [manager.optimize_account() for _ in range(2)] == [True, False]
+
+
+def test_next_trigger_time_ignores_shadow_processors():
+    manager = _goal_manager(dry_run=True)
+    manager.pot_manager.pots.append(make_pot("pot_bills", "Bills M:10,MTD:15", 0))
+    manager.register_shadow_processor("canary", PotMinimumProcessor(manager.pot_manager))
+
+    assert manager.next_trigger_time(datetime.datetime(2026, 3, 10)) is None
@@ -0,0 +1,41 @@
+import datetime
+
+import pytest
+
+from poll_scheduler import PollScheduler
+
+NOW = datetime.datetime(2026, 10, 18, 12)
+
+
+def test_idle_interval_backs_off_to_max():
+    scheduler = PollScheduler(min_interval=2, max_interval=60, backoff=2)
+    sleeps = [scheduler.next_sleep(False, [], NOW) for _ in range(7)]
+
+    assert sleeps == [4, 8, 16, 32, 60, 60, 60]
+
+
+def test_activity_resets_interval():
+    scheduler = PollScheduler(min_interval=2, max_interval=60, backoff=2)
+    for _ in range(4):
+        scheduler.next_sleep(False, [], NOW)
+
+    sleeps = [scheduler.next_sleep(True, [], NOW), scheduler.next_sleep(False, [], NOW)]
+
+    assert sleeps == [2, 4]
+
+
+@pytest.mark.parametrize(
+    ("trigger_times", "expected"),
+    [
+        ([NOW + datetime.timedelta(seconds=3)], 3),
+        ([None, NOW + datetime.timedelta(hours=1), NOW + datetime.timedelta(seconds=1.5)], 1.5),
+        ([NOW + datetime.timedelta(days=3)], 4),
+        ([NOW - datetime.timedelta(seconds=10)], 0),
+        ([None], 4),
+    ],
+    ids=["soon", "earliest", "far", "overdue", "none"],
+)
+def test_sleep_clamped_to_next_trigger(trigger_times, expected):
+    scheduler = PollScheduler(min_interval=2, max_interval=60, backoff=2)
+
+    assert scheduler.next_sleep(False, trigger_times, NOW) == expected
@@ -0,0 +1,101 @@
+import pytest
+
+import pot_distrobuters
+from tests import reference_distrobuters
+from tests.pot_population import PotPopulation, make_population, make_pot
+from transaction_controlers import AccountTransactionGroup
+
+SEEDS = range(25)
+SIZES = [1, 10, 250]
+
+
+def _run(distribution, population: PotPopulation, **kwargs) -> tuple[AccountTransactionGroup, list[tuple[str, int]]]:
+    tc = population.transaction_group()
+    processed_pots = distribution(population.src_pot, population.dest_pots, tc, **kwargs)
+    return tc, [(pot.pot_id, amount) for pot, amount in processed_pots]
+
+
+def _planned(tc: AccountTransactionGroup) -> list[tuple[str, str, int]]:
+    return [(src_pot.pot_id, dest_pot.pot_id, amount) for _, src_pot, dest_pot, amount in tc.pot_transactions]
+
+
+def _assert_conserved(population: PotPopulation, tc: AccountTransactionGroup, processed: list[tuple[str, int]], limit: int):
+    moved = sum(amount for _, amount in processed)
+    assert all(amount > 0 for _, amount in processed)
+    assert moved <= max(limit, 0)
+    assert tc.get_pot_balance(population.src_pot) == population.src_pot.balance - moved
+    assert sum(tc.get_pot_balance(target.pot) - target.pot.balance for target in population.dest_pots) == moved
+    for target in population.dest_pots:
+        # allocators only ever top a pot up to its target
+        assert tc.get_pot_balance(target.pot) <= max(target.target, target.pot.balance)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"src_percentage": 0.35}, {"funding_amount_max": 1_234}],
+    ids=["full", "percentage", "capped"],
+)
+def test_priority_distribution_matches_reference(size, seed, kwargs):
+    population = make_population(size, seed)
+    tc, processed = _run(pot_distrobuters.priority_distribution, population, **kwargs)
+    reference_tc, reference_processed = _run(reference_distrobuters.priority_distribution, population, **kwargs)
+
+    assert processed == reference_processed
+    assert _planned(tc) == _planned(reference_tc)
+    limit = int(population.src_pot.factored_balance * kwargs.get("src_percentage", 1))
+    if kwargs.get("funding_amount_max"):
+        limit = min(limit, kwargs["funding_amount_max"])
+    _assert_conserved(population, tc, processed, limit)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("kwargs", [{}, {"src_percentage": 0.35}], ids=["full", "percentage"])
+def test_weighted_distribution_matches_reference(size, seed, kwargs):
+    population = make_population(size, seed, allow_zero_priority=True)
+    tc, processed = _run(pot_distrobuters.weighted_distribution, population, **kwargs)
+    reference_tc, reference_processed = _run(reference_distrobuters.weighted_distribution, population, **kwargs)
+
+    assert processed == reference_processed
+    assert _planned(tc) == _planned(reference_tc)
+    limit = int(population.src_pot.factored_balance * kwargs.get("src_percentage", 1))
+    _assert_conserved(population, tc, processed, limit)
+
+
+@pytest.mark.parametrize(
+    "distribution", [pot_distrobuters.priority_distribution, pot_distrobuters.weighted_distribution]
+)
+def test_source_below_minimum_moves_nothing(distribution):
+    population = make_population(10, 0)
+    population.src_pot = make_pot("pot_src", "Source FP:1,M:10", 999)
+    tc, processed = _run(distribution, population)
+
+    assert processed == []
+    assert tc.pot_transactions == []
+
+
+def test_priority_distribution_fills_higher_priority_first():
+    high = make_pot("pot_high", "High", 0, 1_000)
+    low = make_pot("pot_low", "Low", 0, 1_000)
+    population = PotPopulation(
+        make_pot("pot_src", "Source FP:1", 1_500),
+        [pot_distrobuters.PotTarget(low, 1_000, 1), pot_distrobuters.PotTarget(high, 1_000, 2)],
+    )
+    tc, processed = _run(pot_distrobuters.priority_distribution, population)
+
+    assert processed == [("pot_high", 1_000), ("pot_low", 500)]
+    assert tc.get_pot_balance(population.src_pot) == 0
+
+
+def test_weighted_distribution_splits_by_priority():
+    heavy = make_pot("pot_heavy", "Heavy", 0, 10_000)
+    light = make_pot("pot_light", "Light", 0, 10_000)
+    population = PotPopulation(
+        make_pot("pot_src", "Source FP:1", 3_000),
+        [pot_distrobuters.PotTarget(heavy, 10_000, 2), pot_distrobuters.PotTarget(light, 10_000, 1)],
+    )
+    _, processed = _run(pot_distrobuters.weighted_distribution, population)
+
+    assert sorted(processed) == [("pot_heavy", 2_000), ("pot_light", 1_000)]
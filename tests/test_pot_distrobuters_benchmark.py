@@ -0,0 +1,33 @@
+import pytest
+
+import pot_distrobuters
+from tests.pot_population import make_population
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [10, 1_000, 10_000, 100_000]
+# the big populations take seconds per round, fewer rounds still gives a stable mean
+LARGE_SIZE = 10_000
+
+
+def _bench(benchmark, distribution, size: int, **population_kwargs):
+    population = make_population(size, seed=size, **population_kwargs)
+
+    def setup():
+        # the group records every transfer, so each round needs a fresh one
+        return (population.src_pot, population.dest_pots, population.transaction_group()), {}
+
+    benchmark.extra_info["pots"] = size
+    benchmark.pedantic(distribution, setup=setup, rounds=5 if size >= LARGE_SIZE else 50, iterations=1)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_priority_distribution_benchmark(benchmark, size):
+    benchmark.group = "priority_distribution"
+    _bench(benchmark, pot_distrobuters.priority_distribution, size)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_weighted_distribution_benchmark(benchmark, size):
+    benchmark.group = "weighted_distribution"
+    _bench(benchmark, pot_distrobuters.weighted_distribution, size, allow_zero_priority=True)
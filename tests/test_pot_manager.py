@@ -0,0 +1,81 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import monzo_pots
+from pot_manager import PotManager
+from spend_index import SpendWindow, utc_now
+
+
+def _transaction(transaction_id, age, amount=-100, **fields):
+    transaction = {
+        "transaction_id": transaction_id,
+        "created": utc_now() - age,
+        "amount": amount,
+        "metadata": {},
+        "category": "groceries",
+        "decline_reason": None,
+        "amount_is_pending": False,
+    }
+    transaction.update(fields)
+    return SimpleNamespace(**transaction)
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    api = SimpleNamespace(pages=[], fetches=[], pot_transactions=[])
+
+    def fetch_transaction_history(auth, account, transaction_since):
+        api.fetches.append(transaction_since)
+        return api.pages.pop(0)
+
+    def fetch_pots(auth, account, transactions):
+        api.pot_transactions.append(sorted(transaction.transaction_id for transaction in transactions))
+        return []
+
+    monkeypatch.setattr(monzo_pots, "fetch_transaction_history", fetch_transaction_history)
+    monkeypatch.setattr(monzo_pots, "fetch_pots", fetch_pots)
+    return api
+
+
+def test_startup_backfills_a_month(fake_api):
+    fake_api.pages.append(
+        [_transaction("old", datetime.timedelta(days=10)), _transaction("new", datetime.timedelta(hours=2))]
+    )
+    pot_manager = PotManager.from_account(None, None)
+
+    assert utc_now() - fake_api.fetches[0] >= SpendWindow.MONTH.value
+    assert pot_manager.spend_index.is_complete(SpendWindow.MONTH)
+    # the pots only see the last day
+    assert [pot_manager.spend_index.category_debit("groceries", SpendWindow.MONTH), fake_api.pot_transactions] == [
+        200,
+        [["new"]],
+    ]
+
+
+def test_update_fetches_from_latest_seen(fake_api):
+    latest = _transaction("b", datetime.timedelta(hours=2))
+    fake_api.pages.append([_transaction("a", datetime.timedelta(hours=5)), latest])
+    pot_manager = PotManager.from_account(None, None)
+    fake_api.pages.append([latest, _transaction("c", datetime.timedelta(minutes=1))])
+    pot_manager.update_pots()
+
+    assert fake_api.fetches[1] == latest.created
+    assert fake_api.pot_transactions[-1] == ["a", "b", "c"]
+    assert [pot_manager.spend_index.category_debit("groceries", window) for window in SpendWindow] == [300, 300, 300]
+    assert pot_manager.spend_index.is_complete(SpendWindow.MONTH)
+
+
+def test_update_refetches_pending(fake_api):
+    pending = _transaction("fx", datetime.timedelta(hours=6), amount_is_pending=True)
+    fake_api.pages.append([pending, _transaction("b", datetime.timedelta(hours=2))])
+    pot_manager = PotManager.from_account(None, None)
+    fake_api.pages.append([_transaction("fx", datetime.timedelta(hours=6), amount=-130, created=pending.created)])
+    pot_manager.update_pots()
+    fake_api.pages.append([])
+    pot_manager.update_pots()
+
+    assert fake_api.fetches[1] == pending.created
+    assert fake_api.fetches[2] > pending.created
+    assert [pot_manager.spend_index.category_debit("groceries", window) for window in SpendWindow] == [230, 230, 230]
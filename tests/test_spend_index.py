@@ -0,0 +1,156 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from spend_index import SpendIndex, SpendWindow
+
+NOW = datetime.datetime(2026, 10, 18, 12)
+
+
+def _transaction(transaction_id, days_ago, amount, **fields):
+    transaction = {
+        "transaction_id": transaction_id,
+        "created": NOW - datetime.timedelta(days=days_ago),
+        "amount": amount,
+        "metadata": {},
+        "category": "groceries",
+        "decline_reason": None,
+        "amount_is_pending": False,
+    }
+    if "pot_id" in fields:
+        transaction["metadata"] = {"pot_id": fields.pop("pot_id")}
+    transaction.update(fields)
+    return SimpleNamespace(**transaction)
+
+
+def _windows(index: SpendIndex, category: str = "groceries") -> list[int]:
+    return [index.category_debit(category, window) for window in SpendWindow]
+
+
+def _index(*transactions, now=NOW) -> SpendIndex:
+    index = SpendIndex()
+    index.update(list(transactions), now - SpendWindow.MONTH.value, now)
+    return index
+
+
+def test_window_admission():
+    index = _index(_transaction("a", 0.5, -500), _transaction("b", 3, -700), _transaction("c", 20, -100))
+
+    assert _windows(index) == [500, 1_200, 1_300]
+
+
+def test_expiry_day_week_month():
+    index = _index(_transaction("a", 0.5, -500), _transaction("b", 3, -700), _transaction("c", 20, -100))
+    totals = []
+    for days in (1, 5, 11):
+        index.update([], NOW, NOW + datetime.timedelta(days=days))
+        totals.append(_windows(index))
+
+    assert totals == [[0, 1_200, 1_300], [0, 500, 1_300], [0, 0, 1_200]]
+
+
+def test_out_of_order_inserts_expire_correctly():
+    index = _index(_transaction("new", 0.1, -100))
+    index.update([_transaction("old", 6, -200), _transaction("mid", 3, -400)], NOW - datetime.timedelta(days=1), NOW)
+    totals = [_windows(index)]
+    index.update([], NOW, NOW + datetime.timedelta(days=1.5))
+    totals.append(_windows(index))
+    index.update([], NOW, NOW + datetime.timedelta(days=4.5))
+    totals.append(_windows(index))
+
+    assert totals == [[100, 700, 700], [0, 500, 700], [0, 100, 700]]
+
+
+def test_older_than_month_ignored():
+    index = _index(_transaction("a", 31, -500))
+
+    assert _windows(index) == [0, 0, 0]
+
+
+def test_redelivered_transaction_counted_once():
+    transaction = _transaction("a", 0.5, -500)
+    index = _index(transaction)
+    index.update([transaction, transaction], NOW - SpendWindow.DAY.value, NOW)
+
+    assert _windows(index) == [500, 500, 500]
+
+
+def test_settled_amount_replaces_pending_amount():
+    index = _index(_transaction("a", 0.5, -500))
+    index.update([_transaction("a", 0.5, -900)], NOW - SpendWindow.DAY.value, NOW)
+    totals = [_windows(index)]
+    index.update([], NOW, NOW + datetime.timedelta(days=8))
+    totals.append(_windows(index))
+
+    assert totals == [[900, 900, 900], [0, 0, 900]]
+
+
+def test_declined_transactions_skipped():
+    index = _index(_transaction("a", 0.5, -500), _transaction("b", 0.5, -700, decline_reason="INSUFFICIENT_FUNDS"))
+
+    assert _windows(index) == [500, 500, 500]
+
+
+def test_transaction_declined_after_recording_is_removed():
+    index = _index(_transaction("a", 0.5, -500))
+    index.update([_transaction("a", 0.5, -500, decline_reason="INSUFFICIENT_FUNDS")], NOW - SpendWindow.DAY.value, NOW)
+
+    assert _windows(index) == [0, 0, 0]
+
+
+def test_pot_and_category_directions():
+    index = _index(
+        _transaction("out", 0.5, 300, pot_id="pot_1", category="savings"),
+        _transaction("in", 0.5, -200, pot_id="pot_1", category="savings"),
+        _transaction("salary", 0.5, 10_000, category="income"),
+    )
+
+    assert [
+        index.pot_debit("pot_1", SpendWindow.DAY),
+        index.pot_credit("pot_1", SpendWindow.DAY),
+        index.category_debit("savings", SpendWindow.DAY),
+        index.category_credit("savings", SpendWindow.DAY),
+        index.category_credit("income", SpendWindow.DAY),
+        index.pot_debit("pot_2", SpendWindow.DAY),
+    ] == [300, 200, 200, 300, 10_000, 0]
+
+
+@pytest.mark.parametrize(
+    ("since", "complete"),
+    [
+        (NOW - SpendWindow.MONTH.value, [True, True, True]),
+        (NOW - SpendWindow.DAY.value, [True, False, False]),
+    ],
+    ids=["backfilled", "one-day"],
+)
+def test_is_complete(since, complete):
+    index = SpendIndex()
+    index.update([], since, NOW)
+
+    assert [index.is_complete(window) for window in SpendWindow] == complete
+
+
+def test_fetch_gap_resets_coverage():
+    index = _index()
+    later = NOW + datetime.timedelta(days=3)
+    index.update([], later - SpendWindow.DAY.value, later)
+
+    assert [index.is_complete(window) for window in SpendWindow] == [True, False, False]
+
+
+def test_next_fetch_since_starts_from_latest_transaction():
+    assert SpendIndex().next_fetch_since() is None
+    index = _index(_transaction("a", 3, -500), _transaction("b", 0.5, -200), _transaction("c", 2, -100))
+
+    assert index.next_fetch_since() == NOW - datetime.timedelta(days=0.5)
+
+
+def test_next_fetch_since_holds_back_for_pending():
+    index = _index(_transaction("a", 3, -500, amount_is_pending=True), _transaction("b", 0.5, -200))
+    held_back = index.next_fetch_since()
+    index.update([_transaction("a", 3, -650)], held_back, NOW)
+
+    assert held_back == NOW - datetime.timedelta(days=3)
+    assert index.next_fetch_since() == NOW - datetime.timedelta(days=0.5)
+    assert _windows(index) == [200, 850, 850]